@@ -14,12 +14,28 @@ Usage::
 
 from __future__ import annotations
 
+import functools
 import json
 import os
 import re
 import sys
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    import ijson
+except ImportError:  # optional: stream-parse the spec when available
+    ijson = None
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:  # optional: faster drop-in for json.loads
+    _loads = json.loads
+
 # ---------------------------------------------------------------------------
 # Paths – relative to the repo root
 # ---------------------------------------------------------------------------
@@ -27,6 +43,8 @@ from pathlib import Path
 REPO_ROOT = Path(__file__).resolve().parent.parent
 OPENAPI_PATH = REPO_ROOT / "docs" / "openapi.json"
 SERVICES_DIR = REPO_ROOT / "crates" / "elevenlabs-sdk" / "src" / "services"
+CLIENT_PATH = REPO_ROOT / "crates" / "elevenlabs-sdk" / "src" / "client.rs"
+CACHE_DIR = REPO_ROOT / ".cache"
 
 # HTTP methods we care about in the OpenAPI spec
 HTTP_METHODS = {"get", "post", "put", "patch", "delete", "head", "options"}
@@ -37,16 +55,95 @@ HTTP_METHODS = {"get", "post", "put", "patch", "delete", "head", "options"}
 # ---------------------------------------------------------------------------
 
 
+_endpoints_cache_path = CACHE_DIR / "openapi_endpoints.json"
+_services_cache_path = CACHE_DIR / "services_index.json"
+
+# Bump when the endpoint dicts built by ``_parse_openapi_uncached`` change.
+ENDPOINTS_CACHE_VERSION = 1
+# Bump when ``_scan_one`` changes beyond the regex sources themselves.
+SERVICES_CACHE_VERSION = 1
+
+
+def _cache_enabled() -> bool:
+    """Return ``False`` when ``COVERAGE_NO_CACHE`` forces a fresh rebuild."""
+    return os.environ.get("COVERAGE_NO_CACHE", "") in ("", "0")
+
+
+def _read_cache(cache_path: Path) -> dict:
+    """Load a sidecar cache file; a missing or corrupt cache reads as empty."""
+    if not _cache_enabled():
+        return {}
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cached if isinstance(cached, dict) else {}
+
+
+def _write_cache(cache_path: Path, data: dict) -> None:
+    """Atomically persist a sidecar cache file; failures are non-fatal."""
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+
+
 def parse_openapi(spec_path: Path) -> list[dict]:
     """Return a list of endpoint dicts from the OpenAPI spec.
 
     Each dict has keys: method, path, operation_id, deprecated.
+
+    The flattened endpoint list is cached in ``.cache/openapi_endpoints.json``
+    keyed on the spec's mtime and size, so warm runs skip the full parse.
+    Set ``COVERAGE_NO_CACHE=1`` to force a rebuild.
     """
-    with open(spec_path, encoding="utf-8") as f:
-        spec = json.load(f)
+    st = spec_path.stat()
+    key = [st.st_mtime_ns, st.st_size]
+    # Results are only reusable while the flattening logic is unchanged
+    parser = [ENDPOINTS_CACHE_VERSION, sorted(HTTP_METHODS)]
+
+    cached = _read_cache(_endpoints_cache_path)
+    endpoints = cached.get("endpoints")
+    if (
+        cached.get("key") == key
+        and cached.get("parser") == parser
+        and isinstance(endpoints, list)
+    ):
+        return endpoints
+
+    endpoints = _parse_openapi_uncached(spec_path)
+    _write_cache(
+        _endpoints_cache_path,
+        {"key": key, "parser": parser, "endpoints": endpoints},
+    )
+    return endpoints
+
+
+def _iter_paths(spec_path: Path) -> Iterator[tuple[str, dict]]:
+    """Yield ``(path, methods)`` pairs from the spec's ``paths`` object.
+
+    Streams with ``ijson`` when it is installed so that only the ``paths``
+    subtree is materialised; otherwise loads the whole document with
+    ``orjson`` (or the stdlib ``json`` module).
+    """
+    if ijson is not None:
+        with open(spec_path, "rb") as f:
+            yield from ijson.kvitems(f, "paths")
+        return
+
+    spec = _loads(spec_path.read_bytes())
+    yield from spec.get("paths", {}).items()
+
 
+def _parse_openapi_uncached(spec_path: Path) -> list[dict]:
+    """Parse the OpenAPI spec from scratch (see :func:`parse_openapi`)."""
     endpoints: list[dict] = []
-    for path, methods in spec.get("paths", {}).items():
+    for path, methods in _iter_paths(spec_path):
         for method, detail in methods.items():
             if method.lower() not in HTTP_METHODS:
                 continue
@@ -69,68 +166,165 @@ def parse_openapi(spec_path: Path) -> list[dict]:
 # 2. Scan Rust service files for implemented endpoints
 # ---------------------------------------------------------------------------
 
+# ``ElevenLabsClient`` request helpers whose first argument is the API path.
+# Keep in sync with ``client.rs``; ``main`` warns about helpers missing here.
+CLIENT_METHODS = [
+    "get",
+    "get_bytes",
+    "post",
+    "post_bytes",
+    "post_stream",
+    "post_multipart",
+    "post_multipart_bytes",
+    "post_multipart_stream",
+    "put",
+    "patch",
+    "delete",
+    "delete_json",
+    "delete_with_body",
+]
+
 # Patterns to extract path strings from Rust service code.
 # Matches path literals like "/v1/models", "/v1/voices", format! paths, etc.
+# Exactly one named group participates in each match, so ``m.lastgroup``
+# identifies which alternative fired.  Patterns are bytes so that source
+# files can be scanned without decoding them first.
+_client_alt = "|".join(map(re.escape, CLIENT_METHODS)).encode()
 PATH_PATTERN = re.compile(
-    r"""
-    (?:
-        # Plain string path:  self.client.get("/v1/foo")
-        \.(?:get|post|post_bytes|post_stream|delete|delete_json|delete_with_body|
-             patch|put|post_multipart|post_multipart_bytes|post_multipart_stream|
-             get_bytes)\s*\(\s*"([^"]+)"
-        |
-        # format! path in let binding: let path = format!("/v1/dubbing/{dubbing_id}")
-        format!\s*\(\s*"([^"]+)"
-        |
-        # Plain string in let binding:  let mut path = "/v1/history".to_owned()
-        (?:let\s+(?:mut\s+)?path\s*=\s*)"([^"]+)"
-        |
-        # Bare string literal containing an API path (e.g. inside a comment or
-        # any other position) — broadest fallback
-        "(/v1/[^"]*)"
-    )
-    """,
-    re.VERBOSE,
+    # Plain string path:  self.client.get("/v1/foo")
+    rb"\.(?:" + _client_alt + rb')\s*\(\s*"(?P<call>[^"]+)"'
+    # format! path in let binding: let path = format!("/v1/dubbing/{dubbing_id}")
+    rb'|format!\s*\(\s*"(?P<fmt>[^"]+)"'
+    # Plain string in let binding:  let mut path = "/v1/history".to_owned()
+    rb'|let\s+(?:mut\s+)?path\s*=\s*"(?P<let>[^"]+)"'
+    # Bare string literal containing an API path (e.g. inside a comment or
+    # any other position) — broadest fallback
+    rb'|"(?P<bare>/v1/[^"]*)"'
 )
 
 # Pattern for doc comment paths, e.g.: /// Calls `POST /v1/text-to-speech/{voice_id}`.
 DOC_PATH_PATTERN = re.compile(
-    r"`(?:GET|POST|PUT|PATCH|DELETE)\s+(/v\d+/[^`]+)`"
+    rb"`(?:GET|POST|PUT|PATCH|DELETE)\s+(/v\d+/[^`]+)`"
+)
+# Substrings that must be present for DOC_PATH_PATTERN to match at all.
+DOC_PATH_MARKERS = (b"`GET", b"`POST", b"`PUT", b"`PATCH", b"`DELETE")
+
+
+# Crate-internal client helpers taking the request path as first argument.
+CLIENT_HELPER_PATTERN = re.compile(
+    r"pub\(crate\)\s+async\s+fn\s+(\w+)[^(]*\(\s*&self\s*,\s*path\s*:\s*&str"
 )
 
 
+def unlisted_client_helpers(client_path: Path) -> list[str]:
+    """Return path-taking helpers in ``client.rs`` missing from CLIENT_METHODS."""
+    try:
+        content = client_path.read_text(encoding="utf-8")
+    except OSError:
+        return []
+    helpers = CLIENT_HELPER_PATTERN.findall(content)
+    return sorted(set(helpers) - set(CLIENT_METHODS))
+
+
 def normalise_path(raw: str) -> str:
     """Normalise a Rust path string to the OpenAPI format.
 
-    Replaces ``{foo_id}`` placeholders and removes query strings.
+    ``format!`` placeholders are already in ``{param}`` form, so only the
+    query string is stripped.
     """
-    # Strip query parameters
-    path = raw.split("?")[0]
-    # Remove format string suffixes like {suffix}
-    # Already in {param} form from format!, leave as-is
-    return path
+    i = raw.find("?")
+    return raw if i < 0 else raw[:i]
+
+
+def _scan_one(rs_path: str) -> set[str]:
+    """Return the normalised API paths referenced by a single service file.
+
+    Paths are interned since the same path is often referenced repeatedly.
+    """
+    found: set[str] = set()
+    with open(rs_path, "rb") as f:
+        content = f.read()
+    # Skip files that cannot contain an API path at all
+    if b"/v1/" not in content and b"/v2/" not in content:
+        return found
+    # Match code-level path strings
+    for m in PATH_PATTERN.finditer(content):
+        raw = m.group(m.lastgroup)
+        if raw and raw.startswith(b"/v"):
+            normalised = normalise_path(raw.decode("utf-8"))
+            found.add(sys.intern(normalised))
+    # Match doc-comment paths like: /// Calls `POST /v1/foo/{id}`.
+    if not any(marker in content for marker in DOC_PATH_MARKERS):
+        return found
+    for m in DOC_PATH_PATTERN.finditer(content):
+        raw = m.group(1)
+        if raw:
+            normalised = normalise_path(raw.decode("utf-8"))
+            found.add(sys.intern(normalised))
+    return found
+
+
+def _cached_paths(entry: object, key: list[int]) -> list[str] | None:
+    """Return the paths of a ``[mtime_ns, size, paths]`` entry matching ``key``."""
+    if not isinstance(entry, list) or len(entry) != 3 or entry[:2] != key:
+        return None
+    paths = entry[2]
+    if not isinstance(paths, list) or not all(isinstance(p, str) for p in paths):
+        return None
+    return paths
 
 
 def scan_services(services_dir: Path) -> set[str]:
-    """Return a set of normalised API paths found in the service source files."""
+    """Return a set of normalised API paths found in the service source files.
+
+    Files are independent, so they are read and scanned on a small thread pool.
+    Per-file results are cached in ``.cache/services_index.json`` keyed on
+    each file's mtime and size, so unchanged files are not re-read.
+    """
+    with os.scandir(services_dir) as it:
+        files = sorted(
+            (
+                e
+                for e in it
+                if e.is_file() and e.name.endswith(".rs") and e.name != "mod.rs"
+            ),
+            key=lambda e: e.name,
+        )
+
+    # Results are only reusable while the extraction logic is unchanged
+    scanner = [
+        SERVICES_CACHE_VERSION,
+        PATH_PATTERN.pattern.decode(),
+        DOC_PATH_PATTERN.pattern.decode(),
+    ]
+    cached = _read_cache(_services_cache_path)
+    cached_files = cached.get("files") if cached.get("scanner") == scanner else None
+    if not isinstance(cached_files, dict):
+        cached_files = {}
+
     implemented: set[str] = set()
+    entries: dict[str, list] = {}
+    stale: list[tuple[str, list[int]]] = []
+    for rs_file in files:
+        # is_file() above came from d_type; stat() still costs one syscall
+        st = rs_file.stat()
+        key = [st.st_mtime_ns, st.st_size]
+        paths = _cached_paths(cached_files.get(rs_file.path), key)
+        if paths is not None:
+            implemented.update(map(sys.intern, paths))
+            entries[rs_file.path] = [*key, paths]
+        else:
+            stale.append((rs_file.path, key))
+
+    if stale:
+        with ThreadPoolExecutor(max_workers=4) as ex:
+            results = ex.map(_scan_one, [rs_path for rs_path, _ in stale])
+            for (rs_path, key), found in zip(stale, results):
+                implemented |= found
+                entries[rs_path] = [*key, sorted(found)]
 
-    for rs_file in sorted(services_dir.glob("*.rs")):
-        if rs_file.name == "mod.rs":
-            continue
-        content = rs_file.read_text(encoding="utf-8")
-        # Match code-level path strings
-        for m in PATH_PATTERN.finditer(content):
-            raw = m.group(1) or m.group(2) or m.group(3) or m.group(4)
-            if raw and raw.startswith("/v"):
-                normalised = normalise_path(raw)
-                implemented.add(normalised)
-        # Match doc-comment paths like: /// Calls `POST /v1/foo/{id}`.
-        for m in DOC_PATH_PATTERN.finditer(content):
-            raw = m.group(1)
-            if raw:
-                normalised = normalise_path(raw)
-                implemented.add(normalised)
+    if stale or len(entries) != len(cached_files):
+        _write_cache(_services_cache_path, {"scanner": scanner, "files": entries})
 
     return implemented
 
@@ -139,9 +333,10 @@ def normalise_openapi_path(path: str) -> str:
     """Normalise an OpenAPI path for comparison.
 
     E.g. ``/v1/voices/{voice_id}`` stays as-is because the Rust code uses
-    the same ``{param}`` syntax via ``format!``.
+    the same ``{param}`` syntax via ``format!``.  The result is interned
+    like the implemented paths it is compared against.
     """
-    return path
+    return sys.intern(path)
 
 
 # ---------------------------------------------------------------------------
@@ -149,19 +344,59 @@ def normalise_openapi_path(path: str) -> str:
 # ---------------------------------------------------------------------------
 
 
-def match_endpoint(ep_path: str, implemented: set[str]) -> bool:
-    """Check whether an OpenAPI endpoint path is covered by an implemented path."""
+def _bucket_key(path: str) -> tuple[int, str]:
+    """Return the ``(segment count, resource segment)`` bucket for a path.
+
+    The resource segment is the one following the version prefix, e.g.
+    ``voices`` for ``/v1/voices/{voice_id}``.
+    """
+    parts = path.split("/", 3)
+    return path.count("/"), parts[2] if len(parts) > 2 else ""
+
+
+def build_index(implemented: set[str]) -> dict[tuple[int, str], list[str]]:
+    """Group implemented paths by :func:`_bucket_key` for placeholder matching."""
+    index: dict[tuple[int, str], list[str]] = defaultdict(list)
+    for path in implemented:
+        index[_bucket_key(path)].append(path)
+    return index
+
+
+@functools.lru_cache(maxsize=None)
+def _compile(path: str) -> re.Pattern[str]:
+    """Compile an OpenAPI path into a regex that accepts any param names."""
+    pattern = re.sub(r"\\\{[^}]+\\\}", r"\\{[^}]+\\}", re.escape(path))
+    return re.compile("^" + pattern + "$")
+
+
+def match_endpoint(
+    ep_path: str,
+    implemented: set[str],
+    index: dict[tuple[int, str], list[str]] | None = None,
+) -> bool:
+    """Check whether an OpenAPI endpoint path is covered by an implemented path.
+
+    When ``index`` (see :func:`build_index`) is given, placeholder matching
+    only considers implemented paths from the same bucket.
+    """
     normalised = normalise_openapi_path(ep_path)
     if normalised in implemented:
         return True
+    # Without placeholders the exact lookup above is the only possible match
+    if "{" not in normalised:
+        return False
 
     # Try matching with parameter placeholders – the OpenAPI path might use
-    # different param names than the Rust code.  Build a regex from the
-    # OpenAPI path and check the implemented set.
-    pattern = re.sub(r"\{[^}]+\}", r"{[^}]+}", re.escape(normalised))
-    pattern = pattern.replace(r"\{[^}]+\}", r"\{[^}]+\}")
-    regex = re.compile("^" + pattern + "$")
-    return any(regex.match(p) for p in implemented)
+    # different param names than the Rust code.
+    regex = _compile(normalised)
+    candidates: Iterable[str] = implemented
+    if index is not None:
+        key = _bucket_key(normalised)
+        # A placeholder or query string in the resource segment can match
+        # paths from other buckets, so fall back to the full set.
+        if "{" not in key[1] and "?" not in key[1]:
+            candidates = index.get(key, ())
+    return any(regex.match(p) for p in candidates)
 
 
 def main() -> None:
@@ -173,8 +408,17 @@ def main() -> None:
         print(f"ERROR: Services directory not found at {SERVICES_DIR}", file=sys.stderr)
         sys.exit(1)
 
+    unlisted = unlisted_client_helpers(CLIENT_PATH)
+    if unlisted:
+        print(
+            "WARNING: client helpers missing from CLIENT_METHODS: "
+            + ", ".join(unlisted),
+            file=sys.stderr,
+        )
+
     endpoints = parse_openapi(OPENAPI_PATH)
     implemented = scan_services(SERVICES_DIR)
+    index = build_index(implemented)
 
     # Separate deprecated from active
     active = [ep for ep in endpoints if not ep["deprecated"]]
@@ -187,7 +431,7 @@ def main() -> None:
     covered = []
     missing = []
     for ep in active:
-        if match_endpoint(ep["path"], implemented):
+        if match_endpoint(ep["path"], implemented, index):
             covered.append(ep)
         else:
             missing.append(ep)
@@ -12,9 +12,9 @@ from __future__ import annotations
 
 import argparse
 import json
-import re
 import sys
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 # ── Mock response data ───────────────────────────────────────────────────────
 
@@ -214,64 +214,125 @@ TTS_AUDIO = b"\xff\xfb\x90\x00" + b"\x00" * 128
 
 # ── Route table ──────────────────────────────────────────────────────────────
 
-# Each entry: (method, compiled regex) -> (status, content_type, body)
-ROUTES: list[tuple[str, re.Pattern[str], int, str, bytes]] = [
-    ("GET", re.compile(r"^/v1/models$"), 200, "application/json", MODELS.encode()),
-    ("GET", re.compile(r"^/v1/voices$"), 200, "application/json", VOICES.encode()),
+# Each entry: (method, path template, status, content_type, body).
+# ``{name}`` segments match any single non-empty path segment.  Literal
+# segments take priority, falling back to ``{name}`` when they lead nowhere.
+ROUTES: list[tuple[str, str, int, str, bytes]] = [
+    ("GET", "/v1/models", 200, "application/json", MODELS.encode()),
+    ("GET", "/v1/voices", 200, "application/json", VOICES.encode()),
     (
         "GET",
-        re.compile(r"^/v1/voices/settings/default$"),
+        "/v1/voices/settings/default",
         200,
         "application/json",
         VOICE_SETTINGS.encode(),
     ),
-    ("GET", re.compile(r"^/v1/user$"), 200, "application/json", USER.encode()),
+    ("GET", "/v1/user", 200, "application/json", USER.encode()),
     (
         "GET",
-        re.compile(r"^/v1/user/subscription$"),
+        "/v1/user/subscription",
         200,
         "application/json",
         SUBSCRIPTION.encode(),
     ),
-    ("GET", re.compile(r"^/v1/history$"), 200, "application/json", HISTORY.encode()),
-    (
-        "POST",
-        re.compile(r"^/v1/text-to-speech/[^/]+$"),
-        200,
-        "audio/mpeg",
-        TTS_AUDIO,
-    ),
+    ("GET", "/v1/history", 200, "application/json", HISTORY.encode()),
+    ("POST", "/v1/text-to-speech/{voice_id}", 200, "audio/mpeg", TTS_AUDIO),
     (
         "GET",
-        re.compile(r"^/v1/voice-generation/generate-voice/parameters$"),
+        "/v1/voice-generation/generate-voice/parameters",
         200,
         "application/json",
         VOICE_GEN_PARAMS.encode(),
     ),
+    ("GET", "/v1/studio/projects", 200, "application/json", PROJECTS.encode()),
+    ("GET", "/v1/dubbing", 200, "application/json", DUBBING.encode()),
+    ("GET", "/v1/convai/agents", 200, "application/json", AGENTS.encode()),
     (
         "GET",
-        re.compile(r"^/v1/studio/projects$"),
-        200,
-        "application/json",
-        PROJECTS.encode(),
-    ),
-    ("GET", re.compile(r"^/v1/dubbing$"), 200, "application/json", DUBBING.encode()),
-    (
-        "GET",
-        re.compile(r"^/v1/convai/agents$"),
-        200,
-        "application/json",
-        AGENTS.encode(),
-    ),
-    (
-        "GET",
-        re.compile(r"^/v1/service-accounts$"),
+        "/v1/service-accounts",
         200,
         "application/json",
         SERVICE_ACCOUNTS.encode(),
     ),
 ]
 
+# ── Route trie ───────────────────────────────────────────────────────────────
+
+PROTOCOL_VERSION = "HTTP/1.1"
+
+# Pre-built response: (status, keep-alive bytes, ``Connection: close`` bytes)
+Response = tuple[int, bytes, bytes]
+
+
+def build_response(status: int, content_type: str, body: bytes) -> Response:
+    """Serialise a complete HTTP response once, headers included.
+
+    A second variant announcing ``Connection: close`` is built alongside for
+    requests after which the server hangs up.
+    """
+    head = (
+        f"{PROTOCOL_VERSION} {status} {HTTPStatus(status).phrase}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+    ).encode("latin-1")
+    keep_alive = head + b"\r\n" + body
+    close = head + b"Connection: close\r\n\r\n" + body
+    return status, keep_alive, close
+
+
+class RouteNode:
+    """One path segment in the route trie."""
+
+    __slots__ = ("children", "param", "response")
+
+    def __init__(self) -> None:
+        self.children: dict[str, RouteNode] = {}
+        self.param: RouteNode | None = None
+        self.response: Response | None = None
+
+
+def build_trie(routes: list[tuple[str, int, str, bytes]]) -> RouteNode:
+    """Build a segment trie from ``(template, status, content_type, body)``."""
+    root = RouteNode()
+    for template, status, content_type, body in routes:
+        node = root
+        for segment in template.split("/")[1:]:
+            if segment.startswith("{") and segment.endswith("}"):
+                if node.param is None:
+                    node.param = RouteNode()
+                node = node.param
+            else:
+                node = node.children.setdefault(segment, RouteNode())
+        node.response = build_response(status, content_type, body)
+    return root
+
+
+def _match(node: RouteNode, segments: list[str], i: int) -> Response | None:
+    """Match ``segments[i:]`` below ``node``, preferring literal children."""
+    if i == len(segments):
+        return node.response
+    segment = segments[i]
+    child = node.children.get(segment)
+    if child is not None:
+        response = _match(child, segments, i + 1)
+        if response is not None:
+            return response
+    if segment and node.param is not None:
+        return _match(node.param, segments, i + 1)
+    return None
+
+
+def lookup(root: RouteNode, path: str) -> Response | None:
+    """Return the response registered for ``path``, if any."""
+    return _match(root, path.split("/")[1:], 0)
+
+
+# One trie per method, so dispatch never compares methods per route.
+ROUTES_BY_METHOD: dict[str, RouteNode] = {
+    method: build_trie([route[1:] for route in ROUTES if route[0] == method])
+    for method in {route[0] for route in ROUTES}
+}
+
 
 # ── Handler ──────────────────────────────────────────────────────────────────
 
@@ -279,33 +340,40 @@ ROUTES: list[tuple[str, re.Pattern[str], int, str, bytes]] = [
 class MockHandler(BaseHTTPRequestHandler):
     """Handles mock API requests."""
 
+    protocol_version = PROTOCOL_VERSION
+
     def _route(self, method: str) -> None:
         # Strip query string for matching
-        path = self.path.split("?")[0]
-        for route_method, pattern, status, content_type, body in ROUTES:
-            if route_method == method and pattern.match(path):
-                self.send_response(status)
-                self.send_header("Content-Type", content_type)
-                self.send_header("Content-Length", str(len(body)))
-                self.end_headers()
-                self.wfile.write(body)
-                return
-        # Not found
-        self.send_response(404)
-        self.send_header("Content-Type", "application/json")
-        msg = json.dumps({"error": f"Not found: {method} {path}"}).encode()
-        self.send_header("Content-Length", str(len(msg)))
-        self.end_headers()
-        self.wfile.write(msg)
+        i = self.path.find("?")
+        path = self.path if i < 0 else self.path[:i]
+        root = ROUTES_BY_METHOD.get(method)
+        response = lookup(root, path) if root is not None else None
+        if response is None:
+            msg = json.dumps({"error": f"Not found: {method} {path}"}).encode()
+            response = build_response(404, "application/json", msg)
+        status, keep_alive, close = response
+        self.log_request(status)
+        self.wfile.write(close if self.close_connection else keep_alive)
 
     def do_GET(self) -> None:  # noqa: N802
         self._route("GET")
 
     def do_POST(self) -> None:  # noqa: N802
-        # Consume request body to avoid broken pipe
-        content_length = int(self.headers.get("Content-Length", 0))
-        if content_length > 0:
-            self.rfile.read(content_length)
+        # Only a Content-Length body can be drained reliably; otherwise the
+        # unread body would be parsed as the next keep-alive request.
+        headers = self.headers
+        if "Content-Length" not in headers or "Transfer-Encoding" in headers:
+            self.close_connection = True
+            self._route("POST")
+            return
+        # Consume request body to avoid broken pipe, in bounded chunks so
+        # large uploads are never held in memory
+        remaining = int(self.headers["Content-Length"])
+        while remaining > 0:
+            chunk = self.rfile.read1(min(remaining, 65536))
+            if not chunk:
+                break
+            remaining -= len(chunk)
         self._route("POST")
 
     def log_message(self, format: str, *args: object) -> None:
@@ -322,7 +390,7 @@ def main() -> None:
     parser.add_argument("--host", type=str, default="127.0.0.1", help="Host to bind to")
     args = parser.parse_args()
 
-    server = HTTPServer((args.host, args.port), MockHandler)
+    server = ThreadingHTTPServer((args.host, args.port), MockHandler)
     print(f"Mock server listening on http://{args.host}:{args.port}", flush=True)
     try:
         server.serve_forever()